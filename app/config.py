@@ -2,6 +2,11 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
+
+
+# Accepted spellings for boolean flags set via environment variables
+_TRUTHY = frozenset({"1", "true", "yes", "on", "y", "t"})
 
 
 @dataclass(frozen=True)
@@ -11,17 +16,40 @@ class Settings:
 	port: int = 8000
 	env: str = "dev"
 	forward_url: str | None = None
+	forward_original_events: bool = False
+	llm_sync: bool = False
+	log_enabled: bool = True
+	log_full_payload: bool = False
+	llm_debug_full_messages: bool = False
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-	"""Load settings from environment with sensible defaults."""
+	"""
+	Load settings from environment with sensible defaults.
+	The result is cached for the process lifetime; call get_settings.cache_clear() to reload.
+	"""
 	port_raw = os.getenv("PORT", "8000")
 	env = os.getenv("ENV", "dev")
 	forward_url = os.getenv("ZAPIER_FORWARD_URL") or os.getenv("FORWARD_URL")
+	forward_original_events = os.getenv("FORWARD_ORIGINAL_EVENTS", "").strip().lower() in _TRUTHY
+	llm_sync = os.getenv("LLM_SYNC", "").strip().lower() in _TRUTHY
+	log_enabled = os.getenv("LOG_ENABLED", "1").strip().lower() in _TRUTHY
+	log_full_payload = os.getenv("LOG_FULL_PAYLOAD", "").strip().lower() in _TRUTHY
+	llm_debug_full_messages = os.getenv("LLM_DEBUG_FULL_MESSAGES", "").strip().lower() in _TRUTHY
 	try:
 		port = int(port_raw)
 	except ValueError:
 		port = 8000
-	return Settings(port=port, env=env, forward_url=forward_url)
+	return Settings(
+		port=port,
+		env=env,
+		forward_url=forward_url,
+		forward_original_events=forward_original_events,
+		llm_sync=llm_sync,
+		log_enabled=log_enabled,
+		log_full_payload=log_full_payload,
+		llm_debug_full_messages=llm_debug_full_messages,
+	)
 
 
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
 import json
 import logging
+import ssl
+import threading
 from datetime import datetime, timezone
 import os
 from typing import Any, Optional
 
+import httpx
+
+from app.config import get_settings
 from app.models import EventStored, ConversationMessage
+from app.log_queue import BatchFileHandler, RawMessageFormatter, attach_queue_listener, log_line
+from app.serialization import dumps
 from app.storage import context_store, conversation_store
 
 try:
-	from openai import OpenAI
+	from openai import DefaultHttpxClient, OpenAI
 except Exception:  # pragma: no cover
+	DefaultHttpxClient = None  # type: ignore
 	OpenAI = None  # type: ignore
 
 
@@ -19,14 +29,53 @@ def _setup_llm_debug_logger() -> logging.Logger:
 	logger = logging.getLogger("llm_debug")
 	logger.setLevel(logging.INFO)
 	if not logger.handlers:
-		# Write compact JSON lines to a dedicated debug file
-		file_handler = logging.FileHandler("llm_output.log", encoding="utf-8")
-		file_handler.setFormatter(logging.Formatter("%(message)s"))
-		logger.addHandler(file_handler)
+		# Write compact JSON lines to a dedicated debug file, off the calling thread
+		file_handler = BatchFileHandler("llm_output.log", encoding="utf-8", delay=True)
+		file_handler.setFormatter(RawMessageFormatter())
+		attach_queue_listener(logger, file_handler)
 	return logger
 
 
 _llm_debug_logger = _setup_llm_debug_logger()
+_UTC = timezone.utc
+
+# Building an SSL context reads the CA bundle from disk; do it once and share it
+_SHARED_SSL_CTX = ssl.create_default_context()
+_client: Optional["OpenAI"] = None
+_client_key_digest: str | None = None
+_client_lock = threading.Lock()
+
+
+def _get_client(api_key: str) -> "OpenAI":
+	"""Return a process-wide OpenAI client, rebuilding it only when the API key changes."""
+	global _client, _client_key_digest
+	digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+	with _client_lock:
+		if _client is None or _client_key_digest != digest:
+			if _client is not None:
+				# The SDK doesn't close an http_client we passed in; release the old pool ourselves
+				_client.close()
+			# DefaultHttpxClient keeps the SDK's defaults (timeout, follow_redirects) on top of ours
+			http_client = DefaultHttpxClient(
+				verify=_SHARED_SSL_CTX,
+				limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+			)
+			_client = OpenAI(api_key=api_key, http_client=http_client)
+			_client_key_digest = digest
+		return _client
+
+
+def close_llm_client() -> None:
+	"""Close the shared OpenAI client and its connection pool; safe to call more than once."""
+	global _client, _client_key_digest
+	with _client_lock:
+		if _client is not None:
+			_client.close()
+		_client = None
+		_client_key_digest = None
+
+
+atexit.register(close_llm_client)
 
 
 def llm_env_status() -> dict[str, Any]:
@@ -38,6 +87,11 @@ def llm_env_status() -> dict[str, Any]:
 	}
 
 
+# Common text fields, highest priority first; matched case-insensitively
+_CANDIDATE_KEYS = ("question", "message", "text", "content", "prompt", "query")
+_CANDIDATE_PRIORITY = {key: rank for rank, key in enumerate(_CANDIDATE_KEYS)}
+
+
 def _extract_user_text(payload: Any) -> str:
 	"""
 	Best-effort extraction of the user's actual message from an arbitrary payload.
@@ -45,12 +99,22 @@ def _extract_user_text(payload: Any) -> str:
 	- Otherwise, stringify the payload.
 	"""
 	if isinstance(payload, dict):
-		candidate_keys = ["question", "message", "text", "content", "prompt", "query"]
-		# Check case-insensitively
-		lower_map = {str(k).lower(): v for k, v in payload.items()}
-		for key in candidate_keys:
-			if key in lower_map and isinstance(lower_map[key], str) and lower_map[key].strip():
-				return lower_map[key].strip()
+		# Single pass over the payload, keeping the highest-priority non-empty match
+		best_rank = len(_CANDIDATE_KEYS)
+		best_text: str | None = None
+		for key, val in payload.items():
+			if not isinstance(key, str) or not isinstance(val, str):
+				continue
+			rank = _CANDIDATE_PRIORITY.get(key.lower())
+			if rank is None or rank >= best_rank:
+				continue
+			text = val.strip()
+			if text:
+				best_rank, best_text = rank, text
+				if rank == 0:
+					break
+		if best_text is not None:
+			return best_text
 		# Fallback to compact JSON string for dicts
 		try:
 			return json.dumps(payload, ensure_ascii=False)
@@ -63,6 +127,17 @@ def _extract_user_text(payload: Any) -> str:
 		return str(payload)
 
 
+_BASE_SYSTEM = (
+	"You are a concise assistant. Respond in one single sentence only. "
+	"Primary instruction: Answer the user's message provided under 'User message' below. "
+	"Do not restate or summarize metadata such as Source or Event ID. "
+	"If the message is not a question, reply with a brief, helpful acknowledgement related to the message. "
+	"Do not include extra explanations or multiple sentences."
+)
+_SYSTEM_CONTEXT_PREFIX = _BASE_SYSTEM + "\n\nContext:\n"
+_USER_MESSAGE_TEMPLATE = "User message:\n%s\n\n[Metadata - ignore for response]\nSource: %s\nEvent ID: %s"
+
+
 def generate_one_sentence_response(event: EventStored) -> Optional[str]:
 	"""
 	Generate a single-sentence response using OpenAI chat completions.
@@ -75,27 +150,18 @@ def generate_one_sentence_response(event: EventStored) -> Optional[str]:
 
 	model = os.getenv("OPENAI_MODEL", "gpt-4.1-nano")
 
-	client = OpenAI(api_key=api_key)
+	client = _get_client(api_key)
 	# Build system message, injecting any in-memory context if present
-	base_system = (
-		"You are a concise assistant. Respond in one single sentence only. "
-		"Primary instruction: Answer the user's message provided under 'User message' below. "
-		"Do not restate or summarize metadata such as Source or Event ID. "
-		"If the message is not a question, reply with a brief, helpful acknowledgement related to the message. "
-		"Do not include extra explanations or multiple sentences."
-	)
 	ctx = context_store.get()
 	if ctx:
-		system_content = f"{base_system}\n\nContext:\n{ctx}"
+		system_content = _SYSTEM_CONTEXT_PREFIX + ctx
 	else:
-		system_content = base_system
+		system_content = _BASE_SYSTEM
 	user_text = _extract_user_text(event.payload)
-	metadata_text = f"Source: {event.source}\nEvent ID: {event.event_id}"
-	# Fetch session history if a session_id exists
+	# Fetch session history if a session_id exists (already in chat-message shape)
 	history_messages: list[dict[str, str]] = []
 	if event.session_id:
-		for m in conversation_store.get(event.session_id):
-			history_messages.append({"role": m.role, "content": m.content})
+		history_messages = conversation_store.get_chat_messages(event.session_id)
 	# Compose final messages: system, history, current user
 	messages = [
 		{
@@ -106,7 +172,7 @@ def generate_one_sentence_response(event: EventStored) -> Optional[str]:
 	messages.extend(history_messages)
 	current_user_message = {
 		"role": "user",
-		"content": f"User message:\n{user_text}\n\n[Metadata - ignore for response]\n{metadata_text}",
+		"content": _USER_MESSAGE_TEMPLATE % (user_text, event.source, event.event_id),
 	}
 	messages.append(current_user_message)
 
@@ -136,17 +202,53 @@ def generate_one_sentence_response(event: EventStored) -> Optional[str]:
 	return response_text
 
 
+# Caps for the debug log so large payloads/histories don't balloon each record
+_LOG_INLINE_PAYLOAD_MAX = 512
+_LOG_MESSAGE_CONTENT_MAX = 2048
+# Log every message (incl. history) instead of a summary; read once at import
+_LOG_FULL_MESSAGES = get_settings().llm_debug_full_messages
+
+
+def _truncate_for_log(text: str) -> str:
+	if len(text) <= _LOG_MESSAGE_CONTENT_MAX:
+		return text
+	return text[:_LOG_MESSAGE_CONTENT_MAX] + "...[truncated]"
+
+
 def _log_llm_roundtrip(event: EventStored, messages: list[dict[str, str]], response_text: Optional[str], model: str, context: Optional[str]) -> None:
-	record = {
-		"timestamp": datetime.now(timezone.utc).isoformat(),
+	# Building the record is the expensive part; skip it entirely when nothing would be emitted
+	if not _llm_debug_logger.isEnabledFor(logging.INFO):
+		return
+	record: dict[str, Any] = {
+		"timestamp": datetime.now(_UTC),
 		"type": "llm_roundtrip",
 		"event_id": event.event_id,
 		"source": event.source,
-		"user_input": event.payload,  # raw payload as provided
-		"openai_request": {
+	}
+	# The current user message already embeds the payload text; only inline small raw payloads
+	payload = event.payload
+	if isinstance(payload, (dict, list)) and len(dumps(payload)) > _LOG_INLINE_PAYLOAD_MAX:
+		record["user_input_ref"] = event.event_id
+	else:
+		record["user_input"] = payload  # raw payload as provided
+	if _LOG_FULL_MESSAGES:
+		openai_request: dict[str, Any] = {
 			"model": model,
-			"messages": messages,
-		},
+			"messages": [{"role": m["role"], "content": _truncate_for_log(m["content"])} for m in messages],
+		}
+	else:
+		# Summarize history; keep the system and current user message verbatim for forensics
+		openai_request = {
+			"model": model,
+			"messages_summary": {
+				"count": len(messages),
+				"char_total": sum(len(m["content"]) for m in messages),
+			},
+			"system": _truncate_for_log(messages[0]["content"]),
+			"user": _truncate_for_log(messages[-1]["content"]),
+		}
+	record.update({
+		"openai_request": openai_request,
 		"openai_response": {
 			"text": response_text,
 		},
@@ -156,10 +258,11 @@ def _log_llm_roundtrip(event: EventStored, messages: list[dict[str, str]], respo
 		},
 		"session": {
 			"id": event.session_id,
-			"history_included": any(m.get("role") in ("user", "assistant") for m in messages[1:-1]) if len(messages) > 2 else False,
+			# Everything between the system and current user message is a history turn
+			"history_included": len(messages) > 2,
 			"history_count": max(0, len(messages) - 2),  # exclude system and current user
 		},
-	}
-	_llm_debug_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+	})
+	log_line(_llm_debug_logger, dumps(record))
 
 
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Listeners started by attach_queue_listener, drained on shutdown
+_LISTENERS: list[QueueListener] = []
+
+
+class RawMessageFormatter(logging.Formatter):
+	"""Emit the log message as-is; our records already carry a complete JSON line."""
+
+	def format(self, record: logging.LogRecord) -> str:
+		return record.getMessage()
+
+
+class _RawQueueHandler(QueueHandler):
+	def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+		# Plain-message records need no formatting or defensive copy before enqueueing
+		if record.args or record.exc_info:
+			return super().prepare(record)
+		return record
+
+
+class _DeferredFlushMixin:
+	# StreamHandler.emit flushes after every record; the listener flushes once per batch instead
+	def flush(self) -> None:
+		pass
+
+	def flush_batch(self) -> None:
+		super().flush()  # type: ignore[misc]
+
+
+class BatchStreamHandler(_DeferredFlushMixin, logging.StreamHandler):
+	"""StreamHandler flushed by the queue listener after each drained batch."""
+
+
+class BatchFileHandler(_DeferredFlushMixin, logging.FileHandler):
+	"""FileHandler flushed by the queue listener after each drained batch."""
+
+
+class _BatchingQueueListener(QueueListener):
+	def dequeue(self, block: bool) -> logging.LogRecord:
+		# Before waiting on an empty queue, flush whatever the last burst wrote
+		if block and self.queue.empty():
+			self._flush_handlers()
+		return self.queue.get(block)
+
+	def stop(self) -> None:
+		super().stop()
+		self._flush_handlers()
+
+	def _flush_handlers(self) -> None:
+		for handler in self.handlers:
+			try:
+				getattr(handler, "flush_batch", handler.flush)()
+			except (OSError, ValueError):
+				# Stream already closed (e.g. at interpreter exit); same leniency as logging.shutdown
+				pass
+
+
+def log_line(logger: logging.Logger, line: str) -> None:
+	"""
+	Hand a preformatted INFO line straight to logger's handlers.
+	Skips Logger._log, whose findCaller stack walk dominates the cost of logger.info.
+	"""
+	logger.handle(logging.LogRecord(logger.name, logging.INFO, "", 0, line, None, None))
+
+
+def attach_queue_listener(logger: logging.Logger, *handlers: logging.Handler) -> None:
+	"""
+	Route logger output through a queue so callers only enqueue records.
+	The given handlers run on a background listener thread; Batch*Handler
+	instances are flushed once per drained burst rather than per record.
+	"""
+	log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+	logger.addHandler(_RawQueueHandler(log_queue))
+	listener = _BatchingQueueListener(log_queue, *handlers, respect_handler_level=True)
+	listener.start()
+	_LISTENERS.append(listener)
+
+
+def stop_queue_listeners() -> None:
+	"""Flush pending records and stop all listeners; safe to call more than once."""
+	while _LISTENERS:
+		_LISTENERS.pop().stop()
+
+
+atexit.register(stop_queue_listeners)
+
+
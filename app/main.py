@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import importlib.util
 import logging
+import secrets
 import sys
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-import os
-from typing import Any
-from uuid import uuid4
+from functools import lru_cache
+from itertools import islice
+from typing import Any, AsyncIterator
+from urllib.parse import parse_qsl
 from collections import deque
 
 from fastapi import FastAPI, APIRouter, Query, BackgroundTasks, Header, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import httpx
 
 from app.config import get_settings
@@ -23,52 +28,87 @@ from app.models import (
 	ContextSetRequest,
 	ContextResponse,
 	SessionHistoryResponse,
-	ConversationMessage,
 	LLMDiagnostics,
+	LogsResponse,
 )
+from app.serialization import dumps, dumps_bytes, loads
 from app.storage import store, context_store, conversation_store
-from app.llm import generate_one_sentence_response, llm_env_status
+from app.llm import close_llm_client, generate_one_sentence_response, llm_env_status
+from app.log_queue import (
+	BatchFileHandler,
+	BatchStreamHandler,
+	RawMessageFormatter,
+	attach_queue_listener,
+	log_line,
+)
 
 
 def _setup_logger() -> logging.Logger:
 	logger = logging.getLogger("zapier_webhook_receiver")
 	logger.setLevel(logging.INFO)
 	if not logger.handlers:
-		handler = logging.StreamHandler(sys.stdout)
+		handler = BatchStreamHandler(sys.stdout)
 		# Output raw JSON strings; keep formatter minimal
-		handler.setFormatter(logging.Formatter("%(message)s"))
-		logger.addHandler(handler)
+		handler.setFormatter(RawMessageFormatter())
 		# Also log to output.log as requested
-		file_handler = logging.FileHandler("output.log", encoding="utf-8")
-		file_handler.setFormatter(logging.Formatter("%(message)s"))
-		logger.addHandler(file_handler)
+		file_handler = BatchFileHandler("output.log", encoding="utf-8", delay=True)
+		file_handler.setFormatter(RawMessageFormatter())
 		# Also keep a small in-memory buffer for /logs endpoint
 		buffer_handler = _InProcessLogHandler()
-		buffer_handler.setFormatter(logging.Formatter("%(message)s"))
-		logger.addHandler(buffer_handler)
+		buffer_handler.setFormatter(RawMessageFormatter())
+		# Writes happen on a background thread; request handlers only enqueue
+		attach_queue_listener(logger, handler, file_handler, buffer_handler)
 	return logger
 
 
 router = APIRouter()
 
 
+_UTC = timezone.utc
+
+
 def _now_utc() -> datetime:
-	return datetime.now(timezone.utc)
+	return datetime.now(_UTC)
+
+
+def _new_event_id() -> str:
+	# 13 hex chars of epoch milliseconds + 48 random bits: sortable by arrival, no UUID object
+	return f"{time.time_ns() // 1_000_000:013x}{secrets.token_hex(6)}"
 
 
 def _get_forward_url() -> str | None:
-	# Prefer per-request environment overrides, then fall back to loaded settings
-	return os.getenv("ZAPIER_FORWARD_URL") or os.getenv("FORWARD_URL") or settings.forward_url
+	# Read from the settings snapshot taken at import; env is not re-read per request
+	return settings.forward_url
+
+
+def _should_forward_original_events() -> bool:
+	return settings.forward_original_events
 
 
-def log_event(message: str, **fields: Any) -> None:
+def log_event(message: str, *, ts: datetime | None = None, **fields: Any) -> None:
+	# Pass ts to reuse a timestamp already taken for the current request; orjson formats it natively
+	if not _LOG_ENABLED or not logger.isEnabledFor(logging.INFO):
+		return
 	record = {
-		"timestamp": _now_utc().isoformat(),
+		"timestamp": ts or datetime.now(_UTC),
 		"level": "INFO",
 		"message": message,
 		**fields,
 	}
-	logger.info(json.dumps(record, ensure_ascii=False))
+	log_line(logger, dumps(record))
+
+# Last emit time per throttle key for log_event_throttled
+_THROTTLE_LAST: dict[str, float] = {}
+
+
+def log_event_throttled(message: str, *, key: str, interval: float = 60.0, **fields: Any) -> None:
+	# For lines whose reason never changes between events; emit at most once per interval
+	now = time.monotonic()
+	last = _THROTTLE_LAST.get(key)
+	if last is not None and now - last < interval:
+		return
+	_THROTTLE_LAST[key] = now
+	log_event(message, **fields)
 
 _LOG_BUFFER: "deque[str]" = deque(maxlen=1000)
 
@@ -84,91 +124,254 @@ class _InProcessLogHandler(logging.Handler):
 
 logger = _setup_logger()
 settings = get_settings()
+# LOG_ENABLED=0 turns log_event into an immediate return
+_LOG_ENABLED = settings.log_enabled
+
+_REDACTED_HEADERS = frozenset({b"authorization", b"proxy-authorization"})
+
+
+def _safe_headers(raw_headers: list[tuple[bytes, bytes]]) -> dict[str, Any]:
+	# Capture headers with sensitive fields filtered
+	safe_headers: dict[str, Any] = {}
+	for k, v in raw_headers:
+		key = k.decode("latin-1")
+		if k.lower() in _REDACTED_HEADERS:
+			safe_headers[key] = "***redacted***"
+		else:
+			# Truncate very long header values
+			val = v.decode("latin-1")
+			safe_headers[key] = val if len(val) <= 256 else (val[:256] + "...[truncated]")
+	return safe_headers
+
+
+# Request bodies longer than this are cut in the incoming_request log line
+_LOG_BODY_MAX = 2048
+# Bodies of other content types are logged as a short hex prefix instead of being decoded
+_LOG_BINARY_PREFIX = 256
+_TEXT_CONTENT_TYPES = (b"application/json", b"text/", b"application/x-www-form-urlencoded")
+
+
+def _is_text_body(raw_headers: list[tuple[bytes, bytes]], body: bytes | bytearray) -> bool:
+	for key, value in raw_headers:
+		if key == b"content-type":
+			value = value.lower()
+			return value.startswith(_TEXT_CONTENT_TYPES) or b"+json" in value
+	# No content type: _parse_body still accepts JSON bodies, so log those as text too
+	return body.lstrip()[:1] in (b"{", b"[")
+
+
+def _has_request_body(raw_headers: list[tuple[bytes, bytes]]) -> bool:
+	# HTTP/1.1 framing: a body is announced by chunked transfer-encoding or a non-zero content-length
+	for key, value in raw_headers:
+		if key == b"transfer-encoding":
+			return True
+		if key == b"content-length" and value.strip() not in (b"", b"0"):
+			return True
+	return False
+
+
+class _RequestLoggerMiddleware:
+	"""
+	Pure ASGI middleware that logs each HTTP request.
+	The body is observed as the app reads it, so nothing is buffered or re-injected.
+	"""
+
+	def __init__(self, app: ASGIApp) -> None:
+		self.app = app
 
-class _RequestLoggerMiddleware(BaseHTTPMiddleware):
-	async def dispatch(self, request: Request, call_next):
-		method = request.method
-		path = request.url.path
-		query = str(request.url.query or "")
-		# Capture headers with sensitive fields filtered
-		safe_headers: dict[str, Any] = {}
-		for k, v in request.headers.items():
-			key_lower = k.lower()
-			if key_lower in {"authorization", "proxy-authorization"}:
-				safe_headers[k] = "***redacted***"
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http":
+			await self.app(scope, receive, send)
+			return
+		# Only the logged prefix is kept; the app still receives every chunk unchanged
+		body = bytearray()
+		truncated = False
+		logged = False
+
+		def log_request() -> None:
+			nonlocal logged
+			logged = True
+			cut = truncated
+			if not body:
+				display_body = ""
+			elif _is_text_body(scope["headers"], body):
+				display_body = body.decode("utf-8", errors="replace")
 			else:
-				# Truncate very long header values
-				val = v if len(v) <= 256 else (v[:256] + "...[truncated]")
-				safe_headers[k] = val
-		# Capture body safely and re-inject for downstream handlers
+				display_body = "hex:" + body[:_LOG_BINARY_PREFIX].hex()
+				cut = cut or len(body) > _LOG_BINARY_PREFIX
+			if cut:
+				display_body += "...[truncated]"
+			log_event(
+				"incoming_request",
+				method=scope["method"],
+				path=scope["path"],
+				query=scope["query_string"].decode("latin-1"),
+				headers=_safe_headers(scope["headers"]),
+				body=display_body,
+			)
+
+		async def logging_receive() -> Message:
+			nonlocal truncated
+			message = await receive()
+			if not logged and message["type"] == "http.request":
+				chunk = message.get("body", b"")
+				room = _LOG_BODY_MAX - len(body)
+				if len(chunk) > room:
+					truncated = True
+					chunk = chunk[:room]
+				body.extend(chunk)
+				if not message.get("more_body", False):
+					log_request()
+			return message
+
+		if not _has_request_body(scope["headers"]):
+			# Nothing to wait for; log now so this line precedes anything the handler logs
+			log_request()
+
+		async def logging_send(message: Message) -> None:
+			# Handlers that never read their body still get the request logged
+			if not logged and message["type"] == "http.response.start":
+				log_request()
+			await send(message)
+
 		try:
-			raw_body = await request.body()
-			display_body = raw_body.decode("utf-8", errors="replace")
-		except Exception:
-			raw_body = b""
-			display_body = ""
-		if len(display_body) > 2048:
-			display_body = display_body[:2048] + "...[truncated]"
-		log_event(
-			"incoming_request",
-			method=method,
-			path=path,
-			query=query,
-			headers=safe_headers,
-			body=display_body,
-		)
-		# Rebuild the receive stream so downstream can read the body again
-		async def _receive():
-			return {"type": "http.request", "body": raw_body, "more_body": False}
-		request._receive = _receive  # type: ignore[attr-defined]
-		response = await call_next(request)
-		return response
+			await self.app(scope, logging_receive, logging_send)
+		finally:
+			# Handler errors and client disconnects can end the request before either hook fires
+			if not logged:
+				log_request()
+
 
 def _payload_size(payload: Any) -> int:
-	try:
-		if isinstance(payload, dict):
-			return len(payload)
-		# Fallback to length of JSON string
-		return len(json.dumps(payload))
-	except Exception:
-		return 0
+	# Informational only: count top-level entries/characters rather than serializing the payload
+	if isinstance(payload, (dict, list, tuple, str)):
+		return len(payload)
+	# Scalars (numbers, booleans, null) are tiny, so their encoded length is cheap to compute
+	return len(dumps_bytes(payload))
+
+
+_JSON_HEADERS = {"content-type": "application/json"}
 
+# HTTP/2 multiplexing needs the optional h2 package (httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
-def _forward_to_zapier(url: str, payload: dict[str, Any]) -> None:
+
+def _new_forward_client() -> httpx.AsyncClient:
+	return httpx.AsyncClient(
+		timeout=10,
+		limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+		http2=_HTTP2_AVAILABLE,
+	)
+
+
+# Shared keep-alive pool so repeated forwards to the same Zapier host skip the TCP/TLS handshake.
+# Opened and closed by _lifespan so it is bound to the loop that serves the app.
+_FORWARD_CLIENT: httpx.AsyncClient | None = None
+
+
+async def _post_forward(url: str, body: bytes) -> httpx.Response:
+	if _FORWARD_CLIENT is not None:
+		return await _FORWARD_CLIENT.post(url, content=body, headers=_JSON_HEADERS)
+	# Running without the app lifespan (e.g. a bare TestClient): fall back to a one-off client
+	async with _new_forward_client() as client:
+		return await client.post(url, content=body, headers=_JSON_HEADERS)
+
+
+async def _forward_to_zapier(url: str, body: bytes, event_id: str | None = None) -> None:
+	# body is pre-encoded JSON so httpx doesn't re-serialize it
 	try:
-		with httpx.Client(timeout=10) as client:
-			resp = client.post(url, json=payload)
-			log_event("forward_result", status_code=resp.status_code, ok=resp.is_success, event_id=payload.get("event_id"))
+		resp = await _post_forward(url, body)
+		log_event("forward_result", status_code=resp.status_code, ok=resp.is_success, event_id=event_id, bytes=len(body))
 	except Exception as exc:
-		log_event("forward_error", error=str(exc))
+		log_event("forward_error", error=str(exc), event_id=event_id, bytes=len(body))
+
 
+@lru_cache(maxsize=1)
+def _cached_llm_status() -> dict[str, Any]:
+	# Library availability and env are fixed for the process lifetime
+	return llm_env_status()
 
-def _llm_and_forward(event: EventStored) -> None:
-	# Call LLM for a one-sentence response
+
+async def _generate_reply(event: EventStored) -> str | None:
+	# Call LLM for a one-sentence response; returns None (after logging why) when there is none
+	status = _cached_llm_status()
 	try:
-		status = llm_env_status()
 		if not status.get("library_available") or not status.get("has_api_key"):
 			reason = "library_missing" if not status.get("library_available") else "missing_api_key"
 			log_event("llm_skipped", event_id=event.event_id, reason=reason, model=status.get("model"))
-			return
-		text = generate_one_sentence_response(event)
+			return None
+		# The OpenAI SDK call is blocking; keep it off the event loop
+		text = await asyncio.to_thread(generate_one_sentence_response, event)
 		if text is None:
 			# This path covers cases like empty completion; provide a reason
 			log_event("llm_skipped", event_id=event.event_id, reason="empty_completion", model=status.get("model"))
-			return
+			return None
 		log_event("llm_result", event_id=event.event_id)
+		return text
 	except Exception as exc:
 		# Log detailed error so operators can see quota/model/permission issues
-		log_event("llm_error", event_id=event.event_id, error=str(exc), model=llm_env_status().get("model"))
+		log_event("llm_error", event_id=event.event_id, error=str(exc), model=status.get("model"))
+		return None
+
+
+async def _llm_and_forward(event: EventStored) -> None:
+	text = await _generate_reply(event)
+	if _should_forward_original_events():
+		# One request carries both the original event and the reply; llm_text is None if the LLM failed
+		payload: dict[str, Any] = {
+			"event_id": event.event_id,
+			"source": event.source,
+			"payload": event.payload,
+			"llm_text": text,
+		}
+	elif text is not None:
+		# Only send the reply text as requested by the integration contract
+		payload = {"reply": text}
+	else:
 		return
-	# Forward LLM result the same way we forward events
 	forward_url = _get_forward_url()
 	if forward_url:
-		# Only send the reply text as requested by the integration contract
-		payload = {"reply": text}
-		_forward_to_zapier(forward_url, payload)
+		await _forward_to_zapier(forward_url, dumps_bytes(payload), event.event_id)
 	else:
-		log_event("forward_skipped", reason="no_forward_url_configured_llm", event_id=event.event_id)
+		log_event_throttled("forward_skipped", key="no_forward_url_configured_llm", reason="no_forward_url_configured_llm", event_id=event.event_id)
+
+
+# Probe order for session-id heuristics, highest priority first
+_SLACK_CHANNEL_KEYS = ("channel", "channel_id")
+_SLACK_THREAD_KEYS = ("thread_ts", "ts")
+_SLACK_USER_KEYS = ("user", "user_id")
+_GENERIC_SESSION_KEYS = ("session_id", "session", "conversation_id", "thread_id", "chat_id", "user_id", "user")
+
+
+def _pick(d: dict[str, Any], keys: tuple[str, ...]) -> str | None:
+	# Fetch first non-empty string from candidate keys
+	for k in keys:
+		val = d.get(k)
+		if val is None:
+			continue
+		# Exact type check: JSON-decoded strings are never str subclasses
+		if type(val) is str:
+			text = val.strip()
+			if text:
+				return text
+			continue
+		# Slack timestamps may be numeric; JSON-decoded values always stringify to non-empty text
+		return str(val)
+	return None
+
+
+def _slack_session_id(d: dict[str, Any]) -> str | None:
+	# Thread-scoped when a thread/message ts is present, otherwise per user in the channel
+	channel = _pick(d, _SLACK_CHANNEL_KEYS)
+	if not channel:
+		return None
+	thread_ts = _pick(d, _SLACK_THREAD_KEYS)
+	if thread_ts:
+		return f"slack:{channel}:{thread_ts}"
+	user = _pick(d, _SLACK_USER_KEYS)
+	if user:
+		return f"slack:{channel}:{user}"
+	return None
 
 
 def _derive_session_id(event: EventIn, x_session_id: str | None) -> str | None:
@@ -178,60 +381,39 @@ def _derive_session_id(event: EventIn, x_session_id: str | None) -> str | None:
 	if x_session_id:
 		return x_session_id
 	payload = event.payload
-	if isinstance(payload, dict):
-		# Helper to fetch first non-empty string from candidate keys
-		def pick(d: dict[str, Any], keys: list[str]) -> str | None:
-			for k in keys:
-				val = d.get(k)
-				if isinstance(val, str) and val.strip():
-					return val.strip()
-				# Slack timestamps may be numeric; accept non-str
-				if not isinstance(val, str) and val is not None:
-					try:
-						s = str(val).strip()
-						if s:
-							return s
-					except Exception:
-						continue
-			return None
-
+	if type(payload) is dict:
 		# Slack Events API style: payload.event.{channel,thread_ts,ts,user}
 		ev = payload.get("event")
-		if isinstance(ev, dict):
-			channel = pick(ev, ["channel", "channel_id"])
-			thread_ts = pick(ev, ["thread_ts", "ts"])
-			user = pick(ev, ["user", "user_id"])
-			if channel and thread_ts:
-				return f"slack:{channel}:{thread_ts}"
-			if channel and user:
-				return f"slack:{channel}:{user}"
+		if type(ev) is dict:
+			session_id = _slack_session_id(ev)
+			if session_id:
+				return session_id
 		# Slack slash/interactive style: flat keys
-		channel = pick(payload, ["channel", "channel_id"])
-		thread_ts = pick(payload, ["thread_ts", "ts"])
-		user = pick(payload, ["user", "user_id"])
-		if channel and thread_ts:
-			return f"slack:{channel}:{thread_ts}"
-		if channel and user:
-			return f"slack:{channel}:{user}"
+		session_id = _slack_session_id(payload)
+		if session_id:
+			return session_id
 		# Common generic keys
-		for key in ["session_id", "session", "conversation_id", "thread_id", "chat_id", "user_id", "user"]:
+		for key in _GENERIC_SESSION_KEYS:
 			val = payload.get(key)
-			if isinstance(val, str) and val.strip():
-				return val.strip()
+			if type(val) is str:
+				text = val.strip()
+				if text:
+					return text
 	# As last resort, group by source to always include some history bucket
 	source = (event.source or "default").lower()
 	return f"{source}:global"
 
 
-def _handle_event_core(
+async def _handle_event_core(
 	event: EventIn,
 	background_tasks: BackgroundTasks,
 	x_session_id: str | None,
 ) -> EventAck:
-	resolved_id = event.event_id or str(uuid4())
+	resolved_id = event.event_id or _new_event_id()
 	received_at = _now_utc()
 	resolved_session = _derive_session_id(event, x_session_id)
 
+	# Fields were already validated as EventIn; the stored copy is a plain dataclass
 	stored = EventStored(
 		event_id=resolved_id,
 		source=event.source,
@@ -243,53 +425,86 @@ def _handle_event_core(
 
 	log_event(
 		"received_event",
+		ts=received_at,
 		event_id=resolved_id,
 		source=event.source,
 		payload_size=_payload_size(event.payload),
 		session_id=resolved_session,
 	)
-	# Log full received payload into output.log as JSON line
-	log_event(
-		"received_event_full",
-		event_id=resolved_id,
-		source=event.source,
-		payload=event.payload,
-		session_id=resolved_session,
-	)
+	# Log full received payload into output.log as JSON line (opt-in; large payloads are costly)
+	if settings.log_full_payload:
+		log_event(
+			"received_event_full",
+			ts=received_at,
+			event_id=resolved_id,
+			source=event.source,
+			payload=event.payload,
+			session_id=resolved_session,
+		)
 
-	# Forward the event to Zapier webhook if configured
-	# Per requirements, do not forward raw events; only forward the LLM reply later
-	# Retain informative log that raw forward is intentionally skipped
-	log_event("forward_skipped", reason="raw_event_forward_disabled", event_id=resolved_id)
+	# Raw events are not forwarded on their own; with FORWARD_ORIGINAL_EVENTS enabled they
+	# are sent together with the LLM reply in a single request from _llm_and_forward
+	if not _should_forward_original_events():
+		# Retain informative log that raw forward is intentionally skipped (throttled; it never changes)
+		log_event_throttled("forward_skipped", key="raw_event_forward_disabled", reason="raw_event_forward_disabled", event_id=resolved_id, ts=received_at)
 
 	# Also invoke LLM and forward its single-sentence response
 	# Allow synchronous execution for environments where background tasks may be constrained
-	llm_sync = (os.getenv("LLM_SYNC", "0").lower() in ("1", "true", "yes"))
-	if llm_sync:
-		log_event("llm_dispatch_mode", mode="sync", event_id=resolved_id)
-		_llm_and_forward(stored)
+	if settings.llm_sync:
+		log_event("llm_dispatch_mode", mode="sync", event_id=resolved_id, ts=received_at)
+		await _llm_and_forward(stored)
 	else:
-		log_event("llm_dispatch_mode", mode="background", event_id=resolved_id)
+		log_event("llm_dispatch_mode", mode="background", event_id=resolved_id, ts=received_at)
 		background_tasks.add_task(_llm_and_forward, stored)
 
-	return EventAck(event_id=resolved_id, stored_at=received_at)
+	# FastAPI validates the returned value against response_model, so build it unvalidated here
+	return EventAck.model_construct(event_id=resolved_id, stored_at=received_at)
+
+
+async def _parse_body(request: Request) -> tuple[Any | None, dict[str, Any] | None]:
+	"""
+	Decode the request body once into (parsed_json, form_fields).
+	The result is cached on request.state so delegating handlers don't re-parse.
+	"""
+	cached = getattr(request.state, "parsed_body", None)
+	if cached is not None:
+		return cached
+	raw = await request.body()
+	parsed_json: Any | None = None
+	content_type = request.headers.get("content-type", "")
+	# Only JSON objects are used as events, so anything not starting with '{' can skip the decoder
+	if content_type.startswith("application/json") or raw.lstrip()[:1] == b"{":
+		try:
+			parsed_json = loads(raw)
+		except ValueError:
+			parsed_json = None
+	form: dict[str, Any] | None = None
+	if not isinstance(parsed_json, dict):
+		if content_type.startswith("application/x-www-form-urlencoded"):
+			# Slack-style simple forms: parse_qsl is far lighter than Starlette's FormParser
+			form = dict(parse_qsl(raw.decode("utf-8", "replace"), keep_blank_values=True))
+		else:
+			try:
+				# Multipart (and anything else) goes through Starlette, served from the cached body
+				form_data = await request.form()
+				form = {k: form_data.get(k) for k in form_data.keys()}
+			except Exception:
+				form = None
+	request.state.parsed_body = (parsed_json, form)
+	return parsed_json, form
 
 
 @router.post("/events", response_model=EventAck)
 async def receive_event(
 	request: Request,
 	background_tasks: BackgroundTasks,
-	x_session_id: str | None = Header(default=None, convert_underscores=False, alias="X-Session-Id"),
+	x_session_id: str | None = Header(default=None),
 ) -> EventAck:
 	"""
 	Accept both JSON and form-encoded bodies at /events and normalize into EventIn.
 	This ensures providers posting to /events (JSON or form) are handled consistently.
 	"""
-	parsed_json: Any | None = None
-	try:
-		parsed_json = await request.json()
-	except Exception:
-		parsed_json = None
+	parsed_json, form = await _parse_body(request)
 
 	if isinstance(parsed_json, dict):
 		# Try to parse as EventIn schema; fall back to wrapped payload
@@ -303,72 +518,61 @@ async def receive_event(
 				payload=payload,
 				session_id=parsed_json.get("session_id"),
 			)
-		return _handle_event_core(event, background_tasks, x_session_id)
+		return await _handle_event_core(event, background_tasks, x_session_id)
 
 	# Form fallback (e.g., Slack)
-	try:
-		form = await request.form()
-		payload_field = form.get("payload")
-		if payload_field:
-			try:
-				payload_obj = json.loads(payload_field)  # type: ignore[arg-type]
-			except Exception:
-				payload_obj = {"payload": payload_field}
-		else:
-			payload_obj = {k: form.get(k) for k in form.keys()}  # type: ignore[union-attr]
-		event = EventIn(event_id=None, source="zapier", payload=payload_obj, session_id=None)
-		return _handle_event_core(event, background_tasks, x_session_id)
-	except Exception:
+	if form is None:
 		# As a last resort, pass empty payload
 		event = EventIn(event_id=None, source="zapier", payload={}, session_id=None)
-		return _handle_event_core(event, background_tasks, x_session_id)
+		return await _handle_event_core(event, background_tasks, x_session_id)
+	payload_field = form.get("payload")
+	if payload_field:
+		try:
+			payload_obj = loads(payload_field)
+		except Exception:
+			payload_obj = {"payload": payload_field}
+	else:
+		payload_obj = form
+	event = EventIn(event_id=None, source="zapier", payload=payload_obj, session_id=None)
+	return await _handle_event_core(event, background_tasks, x_session_id)
 
 
 @router.post("/webhook", response_model=EventAck)
 async def webhook(
 	request: Request,
 	background_tasks: BackgroundTasks,
-	x_session_id: str | None = Header(default=None, convert_underscores=False, alias="X-Session-Id"),
+	x_session_id: str | None = Header(default=None),
 ) -> EventAck:
 	# Accept JSON or form-encoded bodies (Slack may use either)
 	source = "slack"
 	event_id: str | None = None
 	payload: Any = None
-	content_type = request.headers.get("content-type", "")
-	parsed_json: Any | None = None
-	try:
-		parsed_json = await request.json()
-	except Exception:
-		parsed_json = None
+	parsed_json, form = await _parse_body(request)
 	if isinstance(parsed_json, dict):
 		# If the payload is wrapped, prefer 'payload'; otherwise use the full dict
 		payload = parsed_json.get("payload", parsed_json)
 		event_id = parsed_json.get("event_id")
 		source = parsed_json.get("source") or source
-	else:
-		try:
-			form = await request.form()
-			# Slack interactive payloads often embed JSON in 'payload'
-			if "payload" in form:
-				try:
-					payload = json.loads(form.get("payload"))  # type: ignore[arg-type]
-				except Exception:
-					payload = {"payload": form.get("payload")}
-			else:
-				# Fallback: treat full form as a dict
-				payload = {k: form.get(k) for k in form.keys()}  # type: ignore[union-attr]
-		except Exception:
-			payload = None
+	elif form is not None:
+		# Slack interactive payloads often embed JSON in 'payload'
+		if "payload" in form:
+			try:
+				payload = loads(form["payload"])
+			except Exception:
+				payload = {"payload": form["payload"]}
+		else:
+			# Fallback: treat full form as a dict
+			payload = form
 	if payload is None:
 		payload = {}
 	event_in = EventIn(event_id=event_id, source=source, payload=payload, session_id=None)
-	return _handle_event_core(event_in, background_tasks, x_session_id)
+	return await _handle_event_core(event_in, background_tasks, x_session_id)
 
 @router.post("/", response_model=EventAck)
 async def root_webhook(
 	request: Request,
 	background_tasks: BackgroundTasks,
-	x_session_id: str | None = Header(default=None, convert_underscores=False, alias="X-Session-Id"),
+	x_session_id: str | None = Header(default=None),
 ) -> EventAck:
 	# Route root POSTs to the same webhook handler for providers that post to '/'
 	return await webhook(request, background_tasks, x_session_id)
@@ -378,15 +582,18 @@ async def catch_all_post(
 	remaining_path: str,
 	request: Request,
 	background_tasks: BackgroundTasks,
-	x_session_id: str | None = Header(default=None, convert_underscores=False, alias="X-Session-Id"),
+	x_session_id: str | None = Header(default=None),
 ) -> EventAck:
 	# Catch-all POST handler for providers that post to arbitrary paths.
 	# Delegates to the same webhook normalizer.
 	return await webhook(request, background_tasks, x_session_id)
 
 
+# Read/admin handlers below only touch in-memory state and the queued logger, so they are
+# async and run on the event loop instead of being dispatched to the threadpool.
+
 @router.get("/status", response_model=StatusResponse)
-def status() -> StatusResponse:
+async def status() -> StatusResponse:
 	return StatusResponse(
 		events_received=store.count(),
 		last_event=store.latest_summary(),
@@ -394,7 +601,7 @@ def status() -> StatusResponse:
 
 
 @router.get("/events", response_model=EventsListResponse)
-def list_events(offset: int = Query(default=0, ge=0), limit: int = Query(default=10, ge=0, le=100)) -> EventsListResponse:
+async def list_events(offset: int = Query(default=0, ge=0), limit: int = Query(default=10, ge=0, le=100)) -> EventsListResponse:
 	items, total = store.list_events(offset=offset, limit=limit)
 	return EventsListResponse(total=total, offset=offset, limit=limit, items=items)
 
@@ -402,20 +609,20 @@ def list_events(offset: int = Query(default=0, ge=0), limit: int = Query(default
 # --- Context management endpoints (ephemeral; reset on restart) ---
 
 @router.get("/context", response_model=ContextResponse)
-def get_context() -> ContextResponse:
+async def get_context() -> ContextResponse:
 	current = context_store.get()
 	return ContextResponse(context=current)
 
 
 @router.post("/context", response_model=ContextResponse)
-def set_context(body: ContextSetRequest) -> ContextResponse:
+async def set_context(body: ContextSetRequest) -> ContextResponse:
 	context_store.set(body.context)
 	log_event("context_set")
 	return ContextResponse(context=body.context)
 
 
 @router.delete("/context", response_model=ContextResponse)
-def clear_context() -> ContextResponse:
+async def clear_context() -> ContextResponse:
 	context_store.clear()
 	log_event("context_cleared")
 	return ContextResponse(context=None)
@@ -423,22 +630,22 @@ def clear_context() -> ContextResponse:
 # --- Session history endpoints (ephemeral; reset on restart) ---
 
 @router.get("/sessions/{session_id}", response_model=SessionHistoryResponse)
-def get_session_history(session_id: str) -> SessionHistoryResponse:
-	raw = conversation_store.get(session_id)
-	return SessionHistoryResponse(
+async def get_session_history(session_id: str) -> SessionHistoryResponse:
+	# The store already holds validated ConversationMessage instances; hand them over as-is
+	return SessionHistoryResponse.model_construct(
 		session_id=session_id,
-		messages=[ConversationMessage(role=m.role, content=m.content) for m in raw],
+		messages=conversation_store.get(session_id),
 	)
 
 
 @router.delete("/sessions/{session_id}", response_model=SessionHistoryResponse)
-def clear_session_history(session_id: str) -> SessionHistoryResponse:
+async def clear_session_history(session_id: str) -> SessionHistoryResponse:
 	conversation_store.clear(session_id)
 	log_event("session_cleared", session_id=session_id)
 	return SessionHistoryResponse(session_id=session_id, messages=[])
 
 @router.get("/llm/status", response_model=LLMDiagnostics)
-def llm_status() -> LLMDiagnostics:
+async def llm_status() -> LLMDiagnostics:
 	status = llm_env_status()
 	return LLMDiagnostics(
 		library_available=bool(status.get("library_available")),
@@ -446,11 +653,26 @@ def llm_status() -> LLMDiagnostics:
 		model=str(status.get("model")),
 	)
 
-@router.get("/logs")
-def get_logs(limit: int = Query(default=100, ge=1, le=1000)) -> dict[str, Any]:
-	lines = list(_LOG_BUFFER)[-limit:]
-	return {"lines": lines}
+@router.get("/logs", response_model=LogsResponse)
+async def get_logs(limit: int = Query(default=100, ge=1, le=1000)) -> LogsResponse:
+	# Copy only the tail instead of materializing the whole buffer
+	lines = list(islice(_LOG_BUFFER, max(0, len(_LOG_BUFFER) - limit), None))
+	# Lines are already strings; skip re-validating up to 1000 entries
+	return LogsResponse.model_construct(lines=lines)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+	global _FORWARD_CLIENT
+	_FORWARD_CLIENT = _new_forward_client()
+	yield
+	# Release pooled connections on shutdown. The log listeners live as long as the process
+	# (started at import, stopped by atexit), so they outlast repeated app startups.
+	client, _FORWARD_CLIENT = _FORWARD_CLIENT, None
+	await client.aclose()
+	close_llm_client()
+
 
-app = FastAPI(title="Zapier Webhook Receiver", version="1.0.0")
+app = FastAPI(title="Zapier Webhook Receiver", version="1.0.0", lifespan=_lifespan)
 app.add_middleware(_RequestLoggerMiddleware)
 app.include_router(router)
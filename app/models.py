@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Literal, Optional
 
@@ -15,8 +16,9 @@ class EventIn(BaseModel):
 	session_id: Optional[str] = Field(default=None, description="Logical session id for conversation memory")
 
 
-class EventStored(BaseModel):
-	"""Event as stored in memory."""
+@dataclass(slots=True)
+class EventStored:
+	"""Event as stored in memory. A plain dataclass: it is built internally and never validated."""
 
 	event_id: str
 	source: str
@@ -33,7 +35,8 @@ class EventAck(BaseModel):
 	stored_at: datetime
 
 
-class EventSummary(BaseModel):
+@dataclass(slots=True)
+class EventSummary:
 	"""Reduced representation of the latest event for status endpoint."""
 
 	event_id: str
@@ -94,3 +97,7 @@ class LLMDiagnostics(BaseModel):
 	model: str
 
 
+class LogsResponse(BaseModel):
+	"""Recent in-process log lines (JSON strings), oldest first."""
+
+	lines: list[str]
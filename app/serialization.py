@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any
+
+try:
+	import orjson
+except Exception:  # pragma: no cover
+	orjson = None  # type: ignore
+
+
+def _default(obj: Any) -> str:
+	# Match orjson's native RFC 3339 datetimes when falling back to stdlib json
+	if isinstance(obj, datetime):
+		return obj.isoformat()
+	return str(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+	"""
+	Serialize obj to compact UTF-8 JSON bytes, using orjson when it is installed.
+	Datetimes are emitted as ISO 8601 and other unknown types with str(); falls back to stdlib json for values
+	orjson rejects (e.g. integers wider than 64 bits).
+	"""
+	if orjson is not None:
+		try:
+			return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+		except TypeError:
+			pass
+	return json.dumps(obj, ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+	"""Same as dumps_bytes, decoded to str for text sinks such as log handlers."""
+	return dumps_bytes(obj).decode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+	"""Parse JSON with orjson when installed; raises ValueError on invalid input either way."""
+	if orjson is not None:
+		return orjson.loads(data)
+	return json.loads(data)
+
+
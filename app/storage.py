@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from typing import Tuple
 
@@ -13,13 +14,11 @@ class InMemoryEventStore:
 	max_size: int = 100
 
 	def __post_init__(self) -> None:
-		self._events: list[EventStored] = []
+		# Bounded deque gives O(1) FIFO eviction on append
+		self._events: deque[EventStored] = deque(maxlen=self.max_size)
 
 	def add_event(self, event: EventStored) -> None:
 		self._events.append(event)
-		# FIFO eviction
-		if len(self._events) > self.max_size:
-			self._events.pop(0)
 
 	def count(self) -> int:
 		return len(self._events)
@@ -41,13 +40,15 @@ class InMemoryEventStore:
 		)
 
 	def list_events(self, offset: int = 0, limit: int = 10) -> Tuple[list[EventStored], int]:
-		total = len(self._events)
+		# Single C-level copy: total and items come from the same state even if an append interleaves
+		snapshot = tuple(self._events)
+		total = len(snapshot)
 		if offset < 0:
 			offset = 0
 		if limit < 0:
 			limit = 0
 		end = min(offset + limit, total)
-		return self._events[offset:end], total
+		return list(snapshot[offset:end]), total
 
 	def clear(self) -> None:
 		self._events.clear()
@@ -73,11 +74,17 @@ class InMemoryConversationStore:
 
 	def __init__(self, max_messages: int = 20) -> None:
 		self._by_session: dict[str, list[ConversationMessage]] = {}
+		# Same history pre-shaped as OpenAI chat messages, kept in sync with _by_session
+		self._chat_by_session: dict[str, list[dict[str, str]]] = {}
 		self._max_messages = max_messages
 
 	def get(self, session_id: str) -> list[ConversationMessage]:
 		return list(self._by_session.get(session_id, []))
 
+	def get_chat_messages(self, session_id: str) -> list[dict[str, str]]:
+		"""History as {"role", "content"} dicts for the LLM; shared, so callers must not mutate it."""
+		return self._chat_by_session.get(session_id, [])
+
 	def append_messages(self, session_id: str, messages: list[ConversationMessage]) -> None:
 		if not session_id:
 			return
@@ -86,15 +93,20 @@ class InMemoryConversationStore:
 			history = []
 			self._by_session[session_id] = history
 		history.extend(messages)
+		chat = self._chat_by_session.setdefault(session_id, [])
+		chat.extend({"role": m.role, "content": m.content} for m in messages)
 		# Trim to last N messages
 		if len(history) > self._max_messages:
 			self._by_session[session_id] = history[-self._max_messages :]
+			self._chat_by_session[session_id] = chat[-self._max_messages :]
 
 	def clear(self, session_id: str) -> None:
 		self._by_session.pop(session_id, None)
+		self._chat_by_session.pop(session_id, None)
 
 	def clear_all(self) -> None:
 		self._by_session.clear()
+		self._chat_by_session.clear()
 
 
 # Shared store instance used by the app
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Generator
+
+import pytest
+
+from app.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def _reset_settings_cache() -> Generator[None, None, None]:
+	# Settings are memoized per process; reset so each test sees its own env
+	get_settings.cache_clear()
+	yield
+	get_settings.cache_clear()
+
+
+def test_get_settings_is_cached_until_cleared(monkeypatch: pytest.MonkeyPatch) -> None:
+	monkeypatch.setenv("FORWARD_URL", "https://example.test/one")
+	first = get_settings()
+	monkeypatch.setenv("FORWARD_URL", "https://example.test/two")
+	assert get_settings() is first
+	assert get_settings().forward_url == "https://example.test/one"
+
+	get_settings.cache_clear()
+	assert get_settings().forward_url == "https://example.test/two"
+
+
+def test_get_settings_falls_back_on_invalid_port(monkeypatch: pytest.MonkeyPatch) -> None:
+	monkeypatch.setenv("PORT", "not-a-number")
+	assert get_settings().port == 8000
+
+
+@pytest.mark.parametrize("raw, expected", [("1", True), (" Yes ", True), ("on", True), ("0", False), ("", False)])
+def test_forward_original_events_flag_parsing(monkeypatch: pytest.MonkeyPatch, raw: str, expected: bool) -> None:
+	monkeypatch.setenv("FORWARD_ORIGINAL_EVENTS", raw)
+	assert get_settings().forward_original_events is expected
+
+
+def test_log_full_payload_defaults_off(monkeypatch: pytest.MonkeyPatch) -> None:
+	monkeypatch.delenv("LOG_FULL_PAYLOAD", raising=False)
+	assert get_settings().log_full_payload is False
+	get_settings.cache_clear()
+	monkeypatch.setenv("LOG_FULL_PAYLOAD", "true")
+	assert get_settings().log_full_payload is True
+
+
+def test_llm_debug_full_messages_accepts_truthy_spellings(monkeypatch: pytest.MonkeyPatch) -> None:
+	monkeypatch.setenv("LLM_DEBUG_FULL_MESSAGES", "true")
+	assert get_settings().llm_debug_full_messages is True
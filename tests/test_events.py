@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import json
 from typing import Generator
 
+import httpx
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from app import log_queue, main
 from app.main import app
-from app.storage import store
+from app.models import ConversationMessage
+from app.storage import conversation_store, store
 
 
 @pytest.fixture(autouse=True)
@@ -45,6 +51,42 @@ def test_post_events_without_event_id_generates_one() -> None:
 	assert isinstance(data["event_id"], str) and len(data["event_id"]) > 0
 
 
+def test_session_header_is_used_for_session_id() -> None:
+	client = TestClient(app)
+	resp = client.post(
+		"/events",
+		json={"event_id": "evt-hdr", "source": "zapier", "payload": {"hello": "world"}},
+		headers={"X-Session-Id": "abc"},
+	)
+	assert resp.status_code == 200
+	items = client.get("/events").json()["items"]
+	assert items[-1]["session_id"] == "abc"
+
+
+def test_session_history_endpoint_returns_stored_messages() -> None:
+	conversation_store.append_messages(
+		"sess-1",
+		[ConversationMessage(role="user", content="hi"), ConversationMessage(role="assistant", content="hello")],
+	)
+	try:
+		resp = TestClient(app).get("/sessions/sess-1")
+	finally:
+		conversation_store.clear("sess-1")
+	assert resp.status_code == 200
+	assert resp.json() == {
+		"session_id": "sess-1",
+		"messages": [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}],
+	}
+
+
+def test_generated_event_ids_are_time_ordered() -> None:
+	first = main._new_event_id()
+	second = main._new_event_id()
+	assert len(first) == 25 and int(first, 16) >= 0
+	assert first[:13] <= second[:13]
+	assert first != second
+
+
 def test_status_shows_updated_events_received_and_last_event() -> None:
 	client = TestClient(app)
 
@@ -63,3 +105,238 @@ def test_status_shows_updated_events_received_and_last_event() -> None:
 	assert data["last_event"]["payload"] == {"b": 2}
 
 
+@pytest.fixture
+def forwarded(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, dict]]:
+	# LLM is "ready" and replies "Hello back."; forwards are captured as (url, decoded body)
+	captured: list[tuple[str, dict]] = []
+
+	async def fake_forward(url: str, body: bytes, event_id: str | None = None) -> None:
+		captured.append((url, json.loads(body)))
+
+	monkeypatch.setattr(main, "_cached_llm_status", lambda: {"library_available": True, "has_api_key": True, "model": "test"})
+	monkeypatch.setattr(main, "generate_one_sentence_response", lambda event: "Hello back.")
+	monkeypatch.setattr(main, "_get_forward_url", lambda: "https://hooks.example.test/catch")
+	monkeypatch.setattr(main, "_forward_to_zapier", fake_forward)
+	return captured
+
+
+def test_llm_reply_is_forwarded_from_background_task(forwarded: list[tuple[str, dict]]) -> None:
+	client = TestClient(app)
+	resp = client.post("/events", json={"event_id": "evt-llm", "source": "zapier", "payload": {"text": "hi"}})
+	assert resp.status_code == 200
+	assert forwarded == [("https://hooks.example.test/catch", {"reply": "Hello back."})]
+
+
+def test_original_event_and_llm_reply_are_forwarded_together(monkeypatch: pytest.MonkeyPatch, forwarded: list[tuple[str, dict]]) -> None:
+	monkeypatch.setattr(main, "_should_forward_original_events", lambda: True)
+
+	client = TestClient(app)
+	client.post("/events", json={"event_id": "evt-both", "source": "zapier", "payload": {"text": "hi"}})
+	assert [body for _, body in forwarded] == [
+		{"event_id": "evt-both", "source": "zapier", "payload": {"text": "hi"}, "llm_text": "Hello back."},
+	]
+
+
+def test_original_event_is_still_forwarded_when_llm_fails(monkeypatch: pytest.MonkeyPatch, forwarded: list[tuple[str, dict]]) -> None:
+	def failing_llm(event: object) -> str:
+		raise RuntimeError("quota exceeded")
+
+	monkeypatch.setattr(main, "generate_one_sentence_response", failing_llm)
+	monkeypatch.setattr(main, "_should_forward_original_events", lambda: True)
+
+	client = TestClient(app)
+	client.post("/events", json={"event_id": "evt-fallback", "source": "zapier", "payload": {"text": "hi"}})
+	assert [body for _, body in forwarded] == [
+		{"event_id": "evt-fallback", "source": "zapier", "payload": {"text": "hi"}, "llm_text": None},
+	]
+
+
+def test_forward_posts_json_body(monkeypatch: pytest.MonkeyPatch) -> None:
+	seen: list[httpx.Request] = []
+
+	def handler(request: httpx.Request) -> httpx.Response:
+		seen.append(request)
+		return httpx.Response(200)
+
+	monkeypatch.setattr(main, "_FORWARD_CLIENT", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+	asyncio.run(main._forward_to_zapier("https://hooks.example.test/catch", main.dumps_bytes({"reply": "héllo"})))
+
+	assert len(seen) == 1
+	assert seen[0].headers["content-type"] == "application/json"
+	assert json.loads(seen[0].content) == {"reply": "héllo"}
+
+
+def test_forward_error_is_tied_to_its_event(monkeypatch: pytest.MonkeyPatch) -> None:
+	logged: list[tuple[str, dict]] = []
+
+	def handler(request: httpx.Request) -> httpx.Response:
+		raise httpx.ConnectError("refused", request=request)
+
+	monkeypatch.setattr(main, "log_event", lambda message, **fields: logged.append((message, fields)))
+	monkeypatch.setattr(main, "_FORWARD_CLIENT", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+	asyncio.run(main._forward_to_zapier("https://hooks.example.test/catch", b'{"reply":"x"}', "evt-9"))
+
+	assert logged == [("forward_error", {"error": "refused", "event_id": "evt-9", "bytes": 13})]
+
+
+@pytest.mark.parametrize(
+	"payload, header, expected",
+	[
+		({"event": {"channel": "C1", "thread_ts": "171.5", "user": "U1"}}, None, "slack:C1:171.5"),
+		({"event": {"channel": "C1", "user": "U1"}}, None, "slack:C1:U1"),
+		({"channel_id": "C2", "ts": 171.25}, None, "slack:C2:171.25"),
+		({"conversation_id": " conv-9 "}, None, "conv-9"),
+		({"channel": "C3", "session_id": "s-1"}, "hdr-1", "hdr-1"),
+		({"unrelated": True}, None, "zapier:global"),
+		(["not", "a", "dict"], None, "zapier:global"),
+	],
+)
+def test_derive_session_id_heuristics(payload: object, header: str | None, expected: str) -> None:
+	event = main.EventIn(source="Zapier", payload=payload)
+	assert main._derive_session_id(event, header) == expected
+
+
+def test_constant_forward_skipped_line_is_throttled(monkeypatch: pytest.MonkeyPatch) -> None:
+	lines: list[str] = []
+	monkeypatch.setattr(main, "_THROTTLE_LAST", {})
+	monkeypatch.setattr(main, "log_event", lambda message, **fields: lines.append(fields.get("reason")))
+
+	for _ in range(3):
+		main.log_event_throttled("forward_skipped", key="k", reason="raw_event_forward_disabled")
+	assert lines == ["raw_event_forward_disabled"]
+
+	main.log_event_throttled("forward_skipped", key="k", interval=0.0, reason="raw_event_forward_disabled")
+	assert len(lines) == 2
+
+
+@pytest.fixture
+def incoming_requests(monkeypatch: pytest.MonkeyPatch) -> list[dict]:
+	# Fields of each incoming_request line logged by the middleware, in order
+	logged: list[dict] = []
+
+	def fake_log_event(message: str, **fields: object) -> None:
+		if message == "incoming_request":
+			logged.append(fields)
+
+	monkeypatch.setattr(main, "log_event", fake_log_event)
+	return logged
+
+
+def test_requests_are_logged_by_middleware(incoming_requests: list[dict]) -> None:
+	client = TestClient(app)
+	client.post("/events", json={"source": "zapier", "payload": {"a": 1}}, headers={"Authorization": "Bearer secret"})
+	client.get("/status?verbose=1")
+
+	assert [(r["method"], r["path"], r["query"]) for r in incoming_requests] == [("POST", "/events", ""), ("GET", "/status", "verbose=1")]
+	assert json.loads(incoming_requests[0]["body"]) == {"source": "zapier", "payload": {"a": 1}}
+	assert incoming_requests[0]["headers"]["authorization"] == "***redacted***"
+	assert incoming_requests[1]["body"] == ""
+
+
+def test_bodyless_request_is_logged_before_handler_lines(monkeypatch: pytest.MonkeyPatch) -> None:
+	messages: list[str] = []
+	monkeypatch.setattr(main, "log_event", lambda message, **fields: messages.append(message))
+	client = TestClient(app)
+	client.delete("/context")
+
+	assert messages == ["incoming_request", "context_cleared"]
+
+
+def test_middleware_logs_requests_whose_handler_raises(incoming_requests: list[dict]) -> None:
+	failing_app = FastAPI()
+	failing_app.add_middleware(main._RequestLoggerMiddleware)
+
+	@failing_app.get("/boom")
+	async def boom() -> None:
+		raise RuntimeError("boom")
+
+	client = TestClient(failing_app, raise_server_exceptions=False)
+	resp = client.get("/boom")
+
+	assert resp.status_code == 500
+	assert [(r["method"], r["path"]) for r in incoming_requests] == [("GET", "/boom")]
+
+
+def test_middleware_logs_only_a_prefix_of_large_bodies(incoming_requests: list[dict]) -> None:
+	big_text = "x" * 10_000
+	client = TestClient(app)
+	resp = client.post("/events", json={"source": "zapier", "payload": {"text": big_text}})
+
+	assert resp.status_code == 200
+	# The handler still saw the whole body
+	assert store.latest().payload == {"text": big_text}
+	assert len(incoming_requests[0]["body"]) == main._LOG_BODY_MAX + len("...[truncated]")
+	assert incoming_requests[0]["body"].endswith("...[truncated]")
+
+
+def test_middleware_logs_binary_bodies_as_hex(incoming_requests: list[dict]) -> None:
+	client = TestClient(app)
+	client.post("/webhook", content=b"\x00\xffabc", headers={"content-type": "application/octet-stream"})
+
+	assert incoming_requests[0]["body"] == "hex:00ff616263"
+
+
+def test_middleware_decodes_json_bodies_sent_without_content_type(incoming_requests: list[dict]) -> None:
+	client = TestClient(app)
+	client.post("/hooks/custom", content=b'{"source":"x","payload":5}')
+
+	assert incoming_requests[0]["body"] == '{"source":"x","payload":5}'
+
+
+def test_catch_all_json_post_is_parsed_without_content_type() -> None:
+	client = TestClient(app)
+	resp = client.post("/hooks/custom", content=b' {"event_id": "evt-raw", "payload": {"text": "hi"}}')
+	assert resp.status_code == 200
+	assert resp.json()["event_id"] == "evt-raw"
+	assert store.latest().payload == {"text": "hi"}
+
+
+def test_logs_endpoint_returns_most_recent_lines(monkeypatch: pytest.MonkeyPatch) -> None:
+	buffer = main.deque([f"line-{i}" for i in range(5)], maxlen=1000)
+	monkeypatch.setattr(main, "_LOG_BUFFER", buffer)
+	# Keep the request's own log line out of the buffer under test
+	monkeypatch.setattr(main, "_LOG_ENABLED", False)
+	client = TestClient(app)
+	resp = client.get("/logs", params={"limit": 2})
+	assert resp.status_code == 200
+	assert resp.json()["lines"] == ["line-3", "line-4"]
+
+
+def test_slack_form_post_embeds_json_payload() -> None:
+	client = TestClient(app)
+	resp = client.post(
+		"/webhook",
+		content=b"payload=%7B%22channel%22%3A%22C1%22%2C%22user%22%3A%22U1%22%7D&token=",
+		headers={"content-type": "application/x-www-form-urlencoded"},
+	)
+	assert resp.status_code == 200
+	stored = store.latest()
+	assert stored.payload == {"channel": "C1", "user": "U1"}
+	assert stored.session_id == "slack:C1:U1"
+
+
+def test_plain_form_post_to_events_keeps_blank_fields() -> None:
+	client = TestClient(app)
+	resp = client.post(
+		"/events",
+		content=b"text=hello+there&channel=",
+		headers={"content-type": "application/x-www-form-urlencoded; charset=utf-8"},
+	)
+	assert resp.status_code == 200
+	assert store.latest().payload == {"text": "hello there", "channel": ""}
+
+
+def test_forward_client_is_opened_per_app_lifespan() -> None:
+	for _ in range(2):
+		with TestClient(app):
+			client = main._FORWARD_CLIENT
+			assert client is not None and not client.is_closed
+		assert client.is_closed
+		assert main._FORWARD_CLIENT is None
+
+
+def test_app_shutdown_keeps_log_listeners_running() -> None:
+	# Listeners start once at import; an app lifespan cycle must not stop them
+	with TestClient(app):
+		pass
+	assert log_queue._LISTENERS
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app import llm
+from app.models import EventStored
+
+
+@pytest.mark.skipif(llm.OpenAI is None, reason="openai library not installed")
+def test_openai_client_is_reused_until_api_key_changes() -> None:
+	first = llm._get_client("sk-test-one")
+	assert llm._get_client("sk-test-one") is first
+	second = llm._get_client("sk-test-two")
+	assert second is not first
+	# The replaced client's connection pool is released
+	assert first._client.is_closed
+	assert second._client.follow_redirects
+
+	llm.close_llm_client()
+	assert second._client.is_closed
+
+
+def test_extract_user_text_prefers_highest_priority_field_case_insensitively() -> None:
+	payload = {"Text": "low priority", "channel": "C1", "QUESTION": "  what time is it?  "}
+	assert llm._extract_user_text(payload) == "what time is it?"
+
+
+def test_extract_user_text_falls_back_to_json_dump() -> None:
+	assert llm._extract_user_text({"text": "   ", "n": 1}) == '{"text": "   ", "n": 1}'
+
+
+def test_roundtrip_log_summarizes_history(monkeypatch: pytest.MonkeyPatch) -> None:
+	lines: list[str] = []
+	monkeypatch.setattr(llm, "log_line", lambda logger, line: lines.append(line))
+	event = EventStored(event_id="evt-1", source="zapier", payload={"text": "hi"}, received_at=datetime.now(timezone.utc))
+	messages = [
+		{"role": "system", "content": "sys"},
+		{"role": "user", "content": "earlier"},
+		{"role": "assistant", "content": "reply"},
+		{"role": "user", "content": "now"},
+	]
+	llm._log_llm_roundtrip(event, messages, "ok", "test-model", None)
+
+	request = json.loads(lines[0])["openai_request"]
+	assert "messages" not in request
+	assert request["messages_summary"] == {"count": 4, "char_total": 18}
+	assert request["system"] == "sys"
+	assert request["user"] == "now"
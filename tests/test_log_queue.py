@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import io
+import logging
+
+from app import log_queue
+from app.log_queue import BatchStreamHandler, RawMessageFormatter, attach_queue_listener
+
+
+class _CountingStream(io.StringIO):
+	def __init__(self) -> None:
+		super().__init__()
+		self.flushes = 0
+
+	def flush(self) -> None:
+		self.flushes += 1
+		super().flush()
+
+
+def test_queued_lines_are_written_and_flushed_in_batches() -> None:
+	stream = _CountingStream()
+	handler = BatchStreamHandler(stream)
+	handler.setFormatter(RawMessageFormatter())
+	logger = logging.getLogger("test_log_queue")
+	logger.setLevel(logging.INFO)
+	logger.propagate = False
+	attach_queue_listener(logger, handler)
+	listener = log_queue._LISTENERS[-1]
+	try:
+		for i in range(50):
+			logger.info('{"n": %d}' % i)
+	finally:
+		log_queue._LISTENERS.remove(listener)
+		listener.stop()
+		logger.handlers.clear()
+
+	assert stream.getvalue().splitlines() == ['{"n": %d}' % i for i in range(50)]
+	assert 1 <= stream.flushes < 50
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.serialization import dumps, loads
+
+
+def test_dumps_handles_datetimes_and_unicode() -> None:
+	ts = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+	decoded = json.loads(dumps({"at": ts, "text": "héllo"}))
+	assert decoded["text"] == "héllo"
+	assert decoded["at"].startswith("2024-01-02T03:04:05")
+
+
+def test_dumps_falls_back_for_oversized_integers() -> None:
+	assert json.loads(dumps({"n": 2**70})) == {"n": 2**70}
+
+
+def test_stdlib_fallback_formats_datetimes_like_orjson() -> None:
+	ts = datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+	# The oversized integer forces the stdlib path
+	decoded = json.loads(dumps({"at": ts, "n": 2**70}))
+	assert decoded["at"] == json.loads(dumps({"at": ts}))["at"] == "2024-01-02T03:04:05.678000+00:00"
+
+
+def test_loads_parses_bytes_and_rejects_invalid_json() -> None:
+	assert loads(b'{"a": [1, "x"]}') == {"a": [1, "x"]}
+	with pytest.raises(ValueError):
+		loads("{not json")
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.models import ConversationMessage, EventStored
+from app.storage import InMemoryConversationStore, InMemoryEventStore
+
+
+def test_chat_messages_track_appends_trimming_and_clear() -> None:
+	store = InMemoryConversationStore(max_messages=2)
+	store.append_messages("s1", [ConversationMessage(role="user", content="a"), ConversationMessage(role="assistant", content="b")])
+	store.append_messages("s1", [ConversationMessage(role="user", content="c")])
+
+	assert store.get_chat_messages("s1") == [
+		{"role": "assistant", "content": "b"},
+		{"role": "user", "content": "c"},
+	]
+	assert [m.content for m in store.get("s1")] == ["b", "c"]
+
+	store.clear("s1")
+	assert store.get_chat_messages("s1") == []
+
+
+def test_event_store_evicts_oldest_and_pages_in_order() -> None:
+	store = InMemoryEventStore(max_size=3)
+	for i in range(5):
+		store.add_event(EventStored(event_id=f"e{i}", source="test", payload={}, received_at=datetime.now(timezone.utc)))
+
+	assert store.count() == 3
+	assert store.latest().event_id == "e4"
+	items, total = store.list_events(offset=1, limit=5)
+	assert [e.event_id for e in items] == ["e3", "e4"]
+	assert total == 3